@@ -15,39 +15,39 @@
 #
 #    Purpose:  Build tmns applications in a more advanced way
 
-#  Python Standard Libraries
+#  Python Standard Libraries.  Heavier modules (configparser, logging,
+#  subprocess, concurrent.futures) are imported where first used so trivial
+#  invocations such as --help skip their import cost.
 import argparse
-import configparser
-import logging
 import os
-import subprocess
+from dataclasses import dataclass, field
 
 
 # Global Const Value
 DEFAULT_PROFILE_PATH='tmns-profile.cfg'
 
-DEFAULT_REPO_LIST = ['terminus-cmake',
-                     'terminus-log',
-                     'terminus-outcome',
-                     'terminus-core',
-                     'terminus-math',
-                     'terminus-nitf',
-                     'terminus-image',
-                     'terminus-cpp-demos']
-
+#  Default build order.  Names must match the checkout names used by
+#  tmns.default_profiles / tmns-clone-repos.py.
+DEFAULT_REPO_LIST = ['terminus_cmake',
+                     'terminus_log',
+                     'terminus_outcome',
+                     'terminus_core',
+                     'terminus_math',
+                     'terminus_nitf',
+                     'terminus_image',
+                     'terminus_cpp_demos']
+
+@dataclass( slots = True )
 class TerminusRepo:
 
-    def __init__( self,
-                  repo_name,
-                  repo_path,
-                  build_modes,
-                  clean_repo,
-                  build_missing ):
-        self.repo_name     = repo_name
-        self.repo_path     = repo_path
-        self.build_modes   = build_modes
-        self.clean_repo    = clean_repo
-        self.build_missing = build_missing
+    repo_name     : str
+    repo_path     : str
+    build_modes   : list[str]
+    clean_repo    : bool
+    build_missing : bool
+    depends_on    : list[str] = field( default_factory = list )
+
+    def __post_init__( self ):
 
         #  Build modes, if none, will get both release and debug
         if len(self.build_modes) == 0:
@@ -68,64 +68,78 @@ class TerminusRepo:
         bm_flag = { True: '--build-missing',
                     False: '' }
 
-        cmd = f'conan-build.sh {build_flags[build_mode]} {clean_flag[clean_repo]} {bm_flag[build_missing]}'
+        cmd = [ 'conan-build.sh',
+                build_flags[build_mode],
+                clean_flag[clean_repo],
+                bm_flag[build_missing] ]
 
-        return cmd
+        return [ flag for flag in cmd if flag ]
 
     def build( self ):
 
+        import collections
+        import logging
+        import subprocess
+
         logger = logging.getLogger('Repo.build')
 
         #  Check if the directory is installed
         if os.path.exists( self.repo_path ) == False:
-            logger.info( f'    {self.repo_name} not found. Skipping' )
+            logger.info( '    %s not found. Skipping', self.repo_name )
             return
 
-        #  Jump to repo
-        orig_path = os.getcwd()
-        os.chdir( self.repo_path )
-
         for build_mode in self.build_modes:
             build_cmd = self.get_build_command( build_mode    = build_mode,
                                                 clean_repo    = self.clean_repo,
                                                 build_missing = self.build_missing )
-            logger.debug( f'Build Command: {build_cmd}' )
-
-            ret = subprocess.run( build_cmd,
-                                  shell=True,
-                                  stdout=subprocess.PIPE )
-
-            if ret.returncode != 0:
-                logging.error( 'Failed to build.  Details: ' + ret.stdout.decode() )
+            logger.debug( 'Build Command: %s', build_cmd )
+
+            #  Run from the repo directory via cwd rather than os.chdir, which is
+            #  process-global and not safe with multiple builds in flight.  Stream
+            #  output to the logger line-by-line instead of buffering the full log,
+            #  keeping only a short tail around for failure reporting.
+            proc = subprocess.Popen( build_cmd,
+                                     cwd=self.repo_path,
+                                     stdout=subprocess.PIPE,
+                                     stderr=subprocess.STDOUT,
+                                     text=True,
+                                     bufsize=1 )
+
+            log_tail = collections.deque( maxlen = 100 )
+            for line in proc.stdout:
+                line = line.rstrip()
+                log_tail.append( line )
+                logger.debug( line )
+
+            if proc.wait() != 0:
+                logging.error( 'Failed to build.  Details: %s', '\n'.join( log_tail ) )
                 return False
 
-        #  Back up
-        os.chdir(orig_path)
-
         return True
 
     def to_log_string(self, offset = 4 ):
 
         gap = ' ' * offset
-        output  = gap +  '- Repo\n'
-        output += gap + f'    - Name: {self.repo_name}\n'
-        output += gap + f'    - Path: {self.repo_path}\n'
-        output += gap + f'    - Build Modes: {self.build_modes}\n'
-        output += gap + f'    - Clean Repo: {self.clean_repo}\n'
-        return output
 
+        #  Join once rather than growing a string with +=
+        parts = [ gap,  '- Repo\n',
+                  gap, f'    - Name: {self.repo_name}\n',
+                  gap, f'    - Path: {self.repo_path}\n',
+                  gap, f'    - Build Modes: {self.build_modes}\n',
+                  gap, f'    - Clean Repo: {self.clean_repo}\n' ]
+        return ''.join( parts )
+
+@dataclass( slots = True )
 class TerminusProfile:
 
-    def __init__(self, repos):
-        self.repos = repos
+    repos : list[TerminusRepo]
 
     def to_log_string(self):
 
-        output  =  'Terminus Profile:\n'
-        output += f'    repos (cnt: {len(self.repos)})\n'
-        for repo in self.repos:
-            output += repo.to_log_string( 4 )
-        return output
+        parts = [  'Terminus Profile:\n',
+                  f'    repos (cnt: {len(self.repos)})\n' ]
+        parts += [ repo.to_log_string( 4 ) for repo in self.repos ]
+        return ''.join( parts )
 
 
 def load_profile( profile_path,
@@ -134,6 +148,8 @@ def load_profile( profile_path,
                   clean_repos,
                   build_missing ):
 
+    import configparser
+
     print( f'Ignore Profiles: {ignore_profiles}' )
     #  If the user provided a profile and it doesn't exist, exit now
     if profile_path != None and os.path.exists( profile_path ) == False:
@@ -148,18 +164,25 @@ def load_profile( profile_path,
     #  otherwise, use default repo and options
     elif profile_path is None or ignore_profiles:
         repos = []
-        for repo in DEFAULT_REPO_LIST:
+        for idx, repo in enumerate( DEFAULT_REPO_LIST ):
+
+            #  The default list is ordered by dependency, so each repo depends on
+            #  the one before it.
+            depends_on = [] if idx == 0 else [ DEFAULT_REPO_LIST[idx-1] ]
+
             repos.append( TerminusRepo( repo_name     = repo,
                                         repo_path     = repo,
                                         build_modes   = build_modes,
                                         clean_repo    = clean_repos,
-                                        build_missing = build_missing ) )
+                                        build_missing = build_missing,
+                                        depends_on    = depends_on ) )
 
         profile = TerminusProfile( repos = repos )
         return profile
 
-    #  If we have a valid profile, parse it
-    profile_cfg = configparser.ConfigParser()
+    #  If we have a valid profile, parse it.  Raw parser: no field uses
+    #  interpolation, so skip ConfigParser's per-value %()s scanning.
+    profile_cfg = configparser.RawConfigParser( empty_lines_in_values = False )
 
     print( f'Loading Profile: {profile_path}' )
     profile_cfg.read( profile_path )
@@ -171,17 +194,18 @@ def load_profile( profile_path,
 
         repo_name = repo.strip(' \n')
 
-        #  Get repo block
-        repo_info = profile_cfg[repo_name]
+        #  Snapshot the repo block once rather than re-validating it per key
+        repo_info = dict( profile_cfg.items( repo_name ) )
 
         #  Skip if build is set to false
-        if repo_info.getboolean('build') == False:
+        if profile_cfg.getboolean( repo_name, 'build', fallback = None ) == False:
             print( f' Skipping {repo_name} as profile wants to skip building' )
             continue
 
         repo_path       = repo_info.get('path')
         cfg_build_modes = repo_info.get('build_modes').split(',')
-        cfg_clean_repo  = repo_info.getboolean('clean_repo')
+        cfg_clean_repo  = profile_cfg.getboolean( repo_name, 'clean_repo', fallback = None )
+        cfg_depends_on  = [ dep.strip() for dep in repo_info.get('depends_on', '').split(',') if dep.strip() ]
 
         if not clean_repos is None:
             cfg_clean_repo = clean_repos
@@ -190,7 +214,8 @@ def load_profile( profile_path,
                                     repo_path     = repo_path,
                                     build_modes   = cfg_build_modes,
                                     clean_repo    = cfg_clean_repo,
-                                    build_missing = build_missing ) )
+                                    build_missing = build_missing,
+                                    depends_on    = cfg_depends_on ) )
 
     profile = TerminusProfile( repos = repos )
 
@@ -261,10 +286,107 @@ def parse_command_line():
                          default = False,
                          help = 'Tell build system to build missing repos' )
 
+    parser.add_argument( '-j', '--jobs',
+                         dest = 'jobs',
+                         type = int,
+                         default = 1,
+                         required = False,
+                         help = 'Number of repos to build concurrently. Repos only start once their dependencies finish.' )
+
     return parser.parse_args()
 
+def prefilter_repo_paths( repos ):
+    '''
+    Stat every repo path up front with a thread pool so the existence checks
+    overlap instead of running one at a time.
+    '''
+    import concurrent.futures
+
+    with concurrent.futures.ThreadPoolExecutor( max_workers = 16 ) as executor:
+        return dict( zip( [ repo.repo_name for repo in repos ],
+                          executor.map( os.path.exists, [ repo.repo_path for repo in repos ] ) ) )
+
+def build_repos( logger, profile, jobs, allow_failures ):
+
+    import concurrent.futures
+
+    #  Names within the profile.  Dependencies outside of it are treated as satisfied.
+    profile_names = set( repo.repo_name for repo in profile.repos )
+
+    #  Batch the existence checks so missing repos never reach a worker
+    path_exists = prefilter_repo_paths( profile.repos )
+
+    pending   = { repo.repo_name: repo for repo in profile.repos }
+    running   = {}
+    completed = set()
+    failed    = set()
+    halt      = False
+
+    def deps_satisfied( repo ):
+        return all( dep not in profile_names or dep in completed for dep in repo.depends_on )
+
+    with concurrent.futures.ThreadPoolExecutor( max_workers = jobs ) as executor:
+
+        while pending or running:
+
+            #  Dispatch every repo whose dependencies are done.  Skipping a
+            #  missing repo releases its successors immediately, so re-scan
+            #  until the ready set stops growing.
+            if not halt:
+                progress = True
+                while progress:
+                    progress = False
+                    for repo_name in [ name for name, repo in pending.items() if deps_satisfied( repo ) ]:
+                        repo = pending.pop( repo_name )
+
+                        if path_exists[ repo_name ] == False:
+                            logger.info( '    %s not found. Skipping', repo.repo_name )
+                            completed.add( repo_name )
+                            progress = True
+                            continue
+
+                        logger.info( '    Building: %s', repo.repo_name )
+                        running[ executor.submit( repo.build ) ] = repo_name
+
+            if len(running) == 0:
+                if pending and not halt:
+                    logger.error( 'Unsatisfiable repo dependencies: %s', sorted(pending.keys()) )
+                    return False
+                break
+
+            #  Wait for the next build to finish, then release its successors
+            done, _ = concurrent.futures.wait( running,
+                                               return_when = concurrent.futures.FIRST_COMPLETED )
+
+            for future in done:
+                repo_name = running.pop( future )
+
+                #  A skipped repo (missing path) returns None and counts as done
+                if future.result() == False:
+                    failed.add( repo_name )
+                    if allow_failures == False:
+                        halt = True
+
+                completed.add( repo_name )
+
+        #  Drop anything still queued after a failure
+        if halt:
+            for future in running:
+                future.cancel()
+
+    if len(failed) > 0:
+        logger.error( 'Failed to build: %s', sorted(failed) )
+
+    if halt:
+        logger.error( 'Halting Build' )
+        return False
+
+    return True
+
 def configure_logging( options ):
 
+    import logging
+
     severity = logging.getLevelName( options.log_severity )
 
     if options.log_file_path is None:
@@ -289,19 +411,17 @@ def main():
         return 1
 
     #  Setup Logging
+    import logging
     configure_logging( cmd_args )
     logger = logging.getLogger( 'tmns-build-all' )
 
-    logger.info( f'Build Modes: {cmd_args.build_modes}' )
-
-    for repo in profile.repos:
-        logger.info( f'    Building: {repo.repo_name}' )
+    logger.info( 'Build Modes: %s', cmd_args.build_modes )
 
-        res = repo.build()
-
-        if cmd_args.allow_failures == False and res == False:
-            logger.error( 'Halting Build' )
-            return 1
+    if build_repos( logger,
+                    profile,
+                    jobs           = max( cmd_args.jobs, 1 ),
+                    allow_failures = cmd_args.allow_failures ) == False:
+        return 1
 
 
 if __name__ == '__main__':
@@ -14,69 +14,112 @@
 #    Date:    11/19/2025
 #
 
-#  Python Libraries
+#  Python Libraries.  Heavier modules (configparser, logging, subprocess,
+#  concurrent.futures) are imported where first used so trivial invocations
+#  such as --help skip their import cost.
 import argparse
-import configparser
-import logging
+import functools
 import os
 
 from tmns.default_profiles import default_profile
 from tmns.profile import Profile, Repo
+from tmns.profile_cache import load_profile_cached
 
-DEFAULT_PROFILE_PATH = "tmns-profile.cfg"
+DEFAULT_PROFILE_PATH      = "tmns-profile.cfg"
+DEFAULT_TOML_PROFILE_PATH = "tmns-profile.toml"
 
-def load_profile( profile_path = None ) -> Profile:
+def _parse_profile_toml( profile_path ) -> Profile:
 
-    if profile_path is None:
-        profile_path = DEFAULT_PROFILE_PATH
+    #  tomllib parses in C and TOML arrays replace the comma-splitting the
+    #  cfg format needs for tags
+    import tomllib
 
-    if os.path.exists( profile_path ):
+    with open( profile_path, 'rb' ) as fin:
+        data = tomllib.load( fin )
+
+    project_name = data.get( 'profile', {} ).get( 'project_name', 'Unknown Profile' )
+
+    repos = []
+    for section, info in data.get( 'repos', {} ).items():
+        repos.append( Repo( repo_name   = info.get( 'repo_name', section ),
+                            build       = info.get( 'build', True ),
+                            repo_url    = info.get( 'repo_url', '' ),
+                            branch_name = info.get( 'branch_name', 'main' ),
+                            tags        = info.get( 'tags', [] ) ) )
+
+    return Profile( project_name = project_name,
+                    repos        = repos )
+
+def _parse_profile( profile_path ) -> Profile:
+
+    import configparser
+
+    #  None of the profile fields use interpolation, so the raw parser avoids
+    #  the per-value %()s scanning of ConfigParser
+    cfg = configparser.RawConfigParser( empty_lines_in_values = False )
+    cfg.read( profile_path )
+
+    project_name = cfg.get( 'profile', 'project_name', fallback = 'Unknown Profile' )
+
+    repos = []
+    for section in cfg.sections():
+        if section == 'profile':
+            continue
+
+        #  Snapshot the section once rather than re-validating it per key
+        info = dict( cfg.items( section ) )
 
-        cfg = configparser.ConfigParser()
-        cfg.read( profile_path )
+        repo_name = info.get( 'repo_name', section )
+        build     = cfg.getboolean( section, 'build', fallback = True )
+        repo_url  = info.get( 'repo_url', '' )
+        branch    = info.get( 'branch_name', 'main' )
+        tags_raw  = info.get( 'tags', '' )
+        tags      = [ tag.strip() for tag in tags_raw.split(',') if tag.strip() ]
 
-        project_name = cfg.get( 'profile', 'project_name', fallback = 'Unknown Profile' )
+        repos.append( Repo( repo_name   = repo_name,
+                            build       = build,
+                            repo_url    = repo_url,
+                            branch_name = branch,
+                            tags        = tags ) )
 
-        repos = []
-        for section in cfg.sections():
-            if section == 'profile':
-                continue
+    return Profile( project_name = project_name,
+                    repos        = repos )
 
-            repo_name = cfg.get( section, 'repo_name', fallback = section )
-            build     = cfg.getboolean( section, 'build', fallback = True )
-            repo_url  = cfg.get( section, 'repo_url', fallback = '' )
-            branch    = cfg.get( section, 'branch_name', fallback = 'main' )
-            tags_raw  = cfg.get( section, 'tags', fallback = '' )
-            tags      = [ tag.strip() for tag in tags_raw.split(',') if tag.strip() ]
+def load_profile( profile_path = None ) -> Profile:
 
-            repos.append( Repo( repo_name   = repo_name,
-                                build       = build,
-                                repo_url    = repo_url,
-                                branch_name = branch,
-                                tags        = tags ) )
+    #  Prefer the TOML profile when present, falling back to the cfg format
+    if profile_path is None:
+        if os.path.exists( DEFAULT_TOML_PROFILE_PATH ):
+            profile_path = DEFAULT_TOML_PROFILE_PATH
+        else:
+            profile_path = DEFAULT_PROFILE_PATH
 
-        return Profile( project_name = project_name,
-                        repos        = repos )
+    if os.path.exists( profile_path ):
+        parser = _parse_profile_toml if profile_path.endswith( '.toml' ) else _parse_profile
+        return load_profile_cached( profile_path, parser )
 
     return default_profile()
 
+@functools.lru_cache()
+def _get_profile( profile_path = None ) -> Profile:
+    '''
+    Memoized wrapper so parse_command_line and main share a single load.
+    '''
+    return load_profile( profile_path )
+
 def parse_command_line():
 
     parser = argparse.ArgumentParser( description='Clone all repos for the primary Terminus "stack".')
 
-    tag_list = []
-    profile = load_profile()
-    for repo in profile.repos:
-        for tag in repo.tags:
-            if not tag in tag_list:
-                tag_list.append( tag )
+    profile = _get_profile()
+    tag_list = sorted( { tag for repo in profile.repos for tag in repo.tags } )
 
     parser.add_argument( '-v',
                           dest = 'log_level',
-                          default = logging.INFO,
+                          default = 'INFO',
                           required = False,
                           action = 'store_const',
-                          const = logging.DEBUG,
+                          const = 'DEBUG',
                           help = 'Log at debugging level' )
 
     parser.add_argument( '-l', '--log-path',
@@ -99,54 +142,116 @@ def parse_command_line():
                          required= False,
                          help = f'Clone repos with a specific tag. Expected Tags: {tag_list}' )
 
+    parser.add_argument( '-j', '--jobs',
+                         dest = 'jobs',
+                         type = int,
+                         default = None,
+                         required = False,
+                         help = 'Number of repos to clone concurrently.' )
+
+    parser.add_argument( '--full',
+                         dest = 'full_history',
+                         default = False,
+                         action = 'store_true',
+                         required = False,
+                         help = 'Clone full history instead of the default shallow, single-branch clone.' )
+
     return parser.parse_args()
 
 def configure_logging( options ):
 
+    import logging
+
+    severity = logging.getLevelName( options.log_level )
+
     if options.log_file_path is None:
-        logging.basicConfig( level = options.log_level )
+        logging.basicConfig( level = severity )
     else:
-        logging.basicConfig( level = options.log_level, filename = options.log_file_path )
+        logging.basicConfig( level = severity, filename = options.log_file_path )
+
+def _prefilter( repos ):
+    '''
+    Stat every destination directory up front with a thread pool so the
+    existence checks overlap instead of running one at a time.
+    '''
+    import concurrent.futures
+
+    with concurrent.futures.ThreadPoolExecutor( max_workers = 16 ) as executor:
+        return dict( zip( [ repo.repo_name for repo in repos ],
+                          executor.map( os.path.exists, [ repo.repo_name for repo in repos ] ) ) )
+
+def _clone_one( repo, full_history = False ):
+
+    import logging
+    import subprocess
+
+    #  Clone with --branch so the checkout happens in the same git process.
+    #  Shallow, single-branch clones skip refs and history the workspace
+    #  doesn't need; --full restores the old behavior.
+    clone_cmd = [ 'git', 'clone', '--branch', repo.branch_name, '--single-branch' ]
+    if not full_history:
+        clone_cmd += [ '--depth', '1' ]
+    clone_cmd += [ repo.repo_url, repo.repo_name ]
+
+    logging.debug( 'Command: %s', ' '.join( clone_cmd ) )
+
+    #  Capture output so parallel clones don't interleave on the console and
+    #  failures can be reported with git's own message
+    result = subprocess.run( clone_cmd, check=False, capture_output=True, text=True )
+
+    if result.returncode != 0:
+        logging.error( 'git clone of %s failed: %s', repo.repo_name, result.stderr.strip() )
+
+    return result.returncode
 
 def main():
 
+    import concurrent.futures
+    import logging
+
     #  Load command-line arguments
     cmd_args = parse_command_line()
 
     #  Setup logging
     configure_logging( cmd_args )
 
-    profile = load_profile()
+    profile = _get_profile()
 
-    #  Iterate over repo list
-    for repo in profile.repos:
+    #  Batch the existence checks before filtering
+    already_present = _prefilter( profile.repos )
 
-        if len( cmd_args.tags ) > 0:
-            matched = False
-            for tag in repo.tags:
-                if tag in cmd_args.tags:
-                    matched = True
-                    break
-            if matched is False:
-                continue
+    #  Gather the repos which actually need cloning
+    tag_filter = frozenset( cmd_args.tags )
+
+    clone_list = []
+    for repo in profile.repos:
 
-        repo_url     = repo.repo_url
-        repo_name    = repo.repo_name
-        branch_name  = repo.branch_name
+        if tag_filter and not ( tag_filter & repo.tags ):
+            continue
 
         #  Skip cloning if the destination directory already exists
-        if os.path.exists( repo_name ):
-            logging.info( f"Skipping clone of '{repo_name}' because directory already exists (expected branch '{branch_name}')." )
+        if already_present[ repo.repo_name ]:
+            logging.info( "Skipping clone of '%s' because directory already exists (expected branch '%s').", repo.repo_name, repo.branch_name )
             continue
 
-        clone_cmd = f'git clone {repo_url} {repo_name}'
-        logging.debug( f'Command: {clone_cmd}' )
-        os.system( clone_cmd )
+        clone_list.append( repo )
+
+    if len( clone_list ) == 0:
+        return
+
+    #  Clones are network-bound and independent, so run them in parallel
+    max_workers = cmd_args.jobs or min( 8, len( clone_list ) )
+
+    with concurrent.futures.ThreadPoolExecutor( max_workers = max_workers ) as executor:
+
+        futures = { executor.submit( _clone_one, repo, cmd_args.full_history ): repo for repo in clone_list }
 
-        #  Checkout the requested branch
-        checkout_cmd = f'git -C {repo_name} checkout {branch_name}'
-        logging.debug( f'Command: {checkout_cmd}' )
-        os.system( checkout_cmd )
+        for future in concurrent.futures.as_completed( futures ):
+            repo = futures[future]
+            if future.result() != 0:
+                logging.error( "Failed to clone '%s' from %s", repo.repo_name, repo.repo_url )
+            else:
+                logging.info( "Cloned '%s' (branch '%s')", repo.repo_name, repo.branch_name )
 
 if __name__ == '__main__':
     main()
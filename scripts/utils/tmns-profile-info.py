@@ -72,7 +72,7 @@ def profile_to_config(profile: Profile) -> configparser.ConfigParser:
             "build": str(repo.build).lower(),
             "repo_url": repo.repo_url,
             "branch_name": repo.branch_name,
-            "tags": ",".join(repo.tags),
+            "tags": ",".join(sorted(repo.tags)),
         }
 
     return cfg
@@ -121,7 +121,7 @@ def write_profile_config(profile: Profile, profile_path: str) -> None:
             output.write(f"build = {build_value}\n")
             output.write(f"repo_url = {repo.repo_url}\n")
             output.write(f"branch_name = {repo.branch_name}\n")
-            output.write(f"tags = {','.join(repo.tags)}\n\n")
+            output.write(f"tags = {','.join(sorted(repo.tags))}\n\n")
 
 
 def load_profile_from_config(profile_path: str) -> Profile | None:
@@ -130,7 +130,8 @@ def load_profile_from_config(profile_path: str) -> Profile | None:
         print(f"Profile file not found: {profile_path}")
         return None
 
-    cfg = configparser.ConfigParser()
+    # Raw parser: profile fields never use interpolation
+    cfg = configparser.RawConfigParser(empty_lines_in_values=False)
     cfg.read(profile_path)
 
     project_name = cfg.get("profile", "project_name", fallback="Unknown Profile")
@@ -140,11 +141,14 @@ def load_profile_from_config(profile_path: str) -> Profile | None:
         if section == "profile":
             continue
 
-        repo_name = cfg.get(section, "repo_name", fallback=section)
+        # Snapshot the section once rather than re-validating it per key
+        info = dict(cfg.items(section))
+
+        repo_name = info.get("repo_name", section)
         build = cfg.getboolean(section, "build", fallback=True)
-        repo_url = cfg.get(section, "repo_url", fallback="")
-        branch_name = cfg.get(section, "branch_name", fallback="main")
-        tags_raw = cfg.get(section, "tags", fallback="")
+        repo_url = info.get("repo_url", "")
+        branch_name = info.get("branch_name", "main")
+        tags_raw = info.get("tags", "")
         tags = [tag.strip() for tag in tags_raw.split(",") if tag.strip()]
 
         repos.append(
@@ -174,7 +178,7 @@ def print_profile_info(profile: Profile) -> None:
         print(f"  build       : {repo.build}")
         print(f"  repo_url    : {repo.repo_url}")
         print(f"  branch_name : {repo.branch_name}")
-        print(f"  tags        : {', '.join(repo.tags)}")
+        print(f"  tags        : {', '.join(sorted(repo.tags))}")
         print()
 
 
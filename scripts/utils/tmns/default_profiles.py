@@ -16,113 +16,54 @@
 #    Purpose:  Define default Terminus repo metadata and profiles.
 
 #  Python Standard Libraries
+import functools
 
 from tmns.profile import Profile, Repo
 
 
-DEFAULT_REPO_LIST = {
-    'terminus_setup': {
-        'url': 'git@github.com:Terminus-Geospatial/terminus_setup.git',
-        'default_branch': 'main',
-        'tags': ['tools'],
-    },
-    'terminus_cmake': {
-        'url': 'git@github.com:Terminus-Geospatial/terminus_cmake.git',
-        'default_branch': 'main',
-        'tags': ['tools', 'cpp', 'cmake', 'build'],
-    },
-    'terminus_log': {
-        'url': 'git@github.com:Terminus-Geospatial/terminus_log.git',
-        'default_branch': 'main',
-        'tags': ['tools', 'cpp', 'log'],
-    },
-    'terminus_outcome': {
-        'url': 'git@github.com:Terminus-Geospatial/terminus_outcome.git',
-        'default_branch': 'main',
-        'tags': ['tools', 'cpp', 'error'],
-    },
-    'terminus_core': {
-        'url': 'git@github.com:Terminus-Geospatial/terminus_core.git',
-        'default_branch': 'main',
-        'tags': ['tools', 'cpp'],
-    },
-    'terminus_math': {
-        'url': 'git@github.com:Terminus-Geospatial/terminus_math.git',
-        'default_branch': 'main',
-        'tags': ['tools', 'cpp'],
-    },
-    'terminus_ipc': {
-        'url': 'git@github.com:Terminus-Geospatial/terminus_ipc_lib_cpp.git',
-        'default_branch': 'main',
-        'tags': ['tools', 'cpp'],
-    },
-    'terminus_fcs': {
-        'url': 'git@github.com:Terminus-Geospatial/terminus_fcs.git',
-        'default_branch': 'main',
-        'tags': ['tools', 'cpp'],
-    },
-    'terminus_astro': {
-        'url': 'git@github.com:Terminus-Geospatial/terminus_astro.git',
-        'default_branch': 'main',
-        'tags': ['tools', 'cpp'],
-    },
-    'terminus_nitf': {
-        'url': 'git@github.com:Terminus-Geospatial/terminus_nitf.git',
-        'default_branch': 'main',
-        'tags': ['tools', 'cpp'],
-    },
-    'terminus_image': {
-        'url': 'git@github.com:Terminus-Geospatial/terminus_image.git',
-        'default_branch': 'main',
-        'tags': ['tools', 'cpp'],
-    },
-    'terminus_cpp_demos': {
-        'url': 'git@github.com:Terminus-Geospatial/terminus_cpp_demos.git',
-        'default_branch': 'main',
-        'tags': ['tools', 'cpp'],
-    },
-    'terminus_docs': {
-        'url': 'git@github.com:Terminus-Geospatial/terminus_docs.git',
-        'default_branch': 'main',
-        'tags': ['docs'],
-    },
-    'terminus_platform_lib_cpp': {
-        'url': 'git@github.com:Terminus-Geospatial/terminus_platform_lib_cpp.git',
-        'default_branch': 'main',
-        'tags': ['tools', 'cpp'],
-    },
-    'terminus_toolbox': {
-        'url': 'git@github.com:Terminus-Geospatial/terminus_toolbox.git',
-        'default_branch': 'main',
-        'tags': ['tools', 'cpp'],
-    }
-}
+#  ( repo_name, repo_url, default_branch, tags ) rows.  A flat tuple of tuples
+#  keeps the table compact and read-only; Repo objects are materialized once.
+_DEFAULT_REPO_ROWS = (
+    ( 'terminus_setup',            'git@github.com:Terminus-Geospatial/terminus_setup.git',            'main', ('tools',) ),
+    ( 'terminus_cmake',            'git@github.com:Terminus-Geospatial/terminus_cmake.git',            'main', ('tools', 'cpp', 'cmake', 'build') ),
+    ( 'terminus_log',              'git@github.com:Terminus-Geospatial/terminus_log.git',              'main', ('tools', 'cpp', 'log') ),
+    ( 'terminus_outcome',          'git@github.com:Terminus-Geospatial/terminus_outcome.git',          'main', ('tools', 'cpp', 'error') ),
+    ( 'terminus_core',             'git@github.com:Terminus-Geospatial/terminus_core.git',             'main', ('tools', 'cpp') ),
+    ( 'terminus_math',             'git@github.com:Terminus-Geospatial/terminus_math.git',             'main', ('tools', 'cpp') ),
+    ( 'terminus_ipc',              'git@github.com:Terminus-Geospatial/terminus_ipc_lib_cpp.git',      'main', ('tools', 'cpp') ),
+    ( 'terminus_fcs',              'git@github.com:Terminus-Geospatial/terminus_fcs.git',              'main', ('tools', 'cpp') ),
+    ( 'terminus_astro',            'git@github.com:Terminus-Geospatial/terminus_astro.git',            'main', ('tools', 'cpp') ),
+    ( 'terminus_nitf',             'git@github.com:Terminus-Geospatial/terminus_nitf.git',             'main', ('tools', 'cpp') ),
+    ( 'terminus_image',            'git@github.com:Terminus-Geospatial/terminus_image.git',            'main', ('tools', 'cpp') ),
+    ( 'terminus_cpp_demos',        'git@github.com:Terminus-Geospatial/terminus_cpp_demos.git',        'main', ('tools', 'cpp') ),
+    ( 'terminus_docs',             'git@github.com:Terminus-Geospatial/terminus_docs.git',             'main', ('docs',) ),
+    ( 'terminus_platform_lib_cpp', 'git@github.com:Terminus-Geospatial/terminus_platform_lib_cpp.git', 'main', ('tools', 'cpp') ),
+    ( 'terminus_toolbox',          'git@github.com:Terminus-Geospatial/terminus_toolbox.git',          'main', ('tools', 'cpp') ),
+)
 
 
+@functools.lru_cache( maxsize = 1 )
 def default_repo_list():
     """
-    Returns a list of default repos for the Terminus toolchain
+    Returns a tuple of default repos for the Terminus toolchain.  Repo objects
+    are immutable, so the tuple is built once per process and shared.
     """
-    repos = []
-
-    for repo_name, cfg in DEFAULT_REPO_LIST.items():
-        repos.append(Repo(
-            repo_name=repo_name,
-            build=True,
-            repo_url=cfg['url'],
-            branch_name=cfg['default_branch'],
-            tags=cfg['tags'],
-        ))
-
-    return repos
+    return tuple( Repo( repo_name   = repo_name,
+                        build       = True,
+                        repo_url    = repo_url,
+                        branch_name = default_branch,
+                        tags        = tags )
+                  for repo_name, repo_url, default_branch, tags in _DEFAULT_REPO_ROWS )
 
+@functools.lru_cache( maxsize = 1 )
 def default_profile():
     '''
     Creates a default profile the user can use to make a profile document.
+    The Profile and its repos are immutable, so one shared instance serves
+    every caller in the process.
     '''
 
     return Profile(
         project_name='Terminus Workspace',
         repos=default_repo_list(),
     )
-
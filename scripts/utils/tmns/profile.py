@@ -1,39 +1,48 @@
 
 
-class Repo:
+#  Python Standard Libraries
+import sys
+from dataclasses import dataclass
+
 
-    def __init__( self,
-                  repo_name,
-                  build: bool,
-                  repo_url,
-                  branch_name,
-                  tags : list[str] ):
-        '''
-        repo_name: Name of the repo
-        build: Whether to build the repo
-        repo_url: URL of the repo
-        branch_name: Name of the branch
-        tags: List of tags
-        '''
-        self.repo_name = repo_name
-        self.build = build
-        self.repo_url = repo_url
-        self.branch_name = branch_name
-        self.tags = tags
+@dataclass( slots = True, frozen = True )
+class Repo:
+    '''
+    repo_name: Name of the repo
+    build: Whether to build the repo
+    repo_url: URL of the repo
+    branch_name: Name of the branch
+    tags: Tags describing the repo
+    '''
+
+    repo_name   : str
+    build       : bool
+    repo_url    : str
+    branch_name : str
+    tags        : frozenset[str] = frozenset()
+
+    def __post_init__(self):
+        #  Normalize so callers can pass any iterable and instances stay
+        #  hashable.  Interned tag strings let set operations compare by
+        #  pointer, and identical tags are shared across repos.
+        object.__setattr__( self, 'tags', frozenset( sys.intern( tag ) for tag in self.tags ) )
 
     def __str__(self):
         return f"Repo:\n  - Name: {self.repo_name}\n  - Build: {self.build}\n  - Repo URL: {self.repo_url}\n  - Branch Name: {self.branch_name}"
 
+
+@dataclass( slots = True, frozen = True )
 class Profile:
+    '''
+    project_name: Name of the project
+    repos: Repos belonging to the project
+    '''
 
-    def __init__( self,
-                  project_name : str,
-                  repos : list[Repo] ):
+    project_name : str
+    repos        : tuple[Repo, ...] = ()
 
-        self.project_name = project_name
-        self.repos = repos
+    def __post_init__(self):
+        object.__setattr__( self, 'repos', tuple( self.repos ) )
 
     def __str__(self):
         return f"Profile Repos: {self.repos}"
-
-
@@ -0,0 +1,81 @@
+#!/usr/bin/env python3
+#
+############################# INTELLECTUAL PROPERTY RIGHTS #############################
+##                                                                                    ##
+##                           Copyright (c) 2024 Terminus LLC                          ##
+##                                All Rights Reserved.                                ##
+##                                                                                    ##
+##          Use of this source code is governed by LICENSE in the repo root.          ##
+##                                                                                    ##
+############################# INTELLECTUAL PROPERTY RIGHTS #############################
+#
+#    File:    profile_cache.py
+#    Author:  Marvin Smith
+#    Date:    8/28/2026
+#
+#    Purpose:  Cache parsed profile documents between script invocations.
+
+#  Python Standard Libraries
+import hashlib
+import os
+import pickle
+
+
+CACHE_DIR = os.path.join( os.path.expanduser( '~' ), '.cache', 'tmns' )
+
+#  Bump whenever the pickled Profile layout changes so stale caches re-parse
+CACHE_VERSION = 3
+
+#  In-process memo so repeated loads of the same unchanged file parse only once
+_memo = {}
+
+
+def _cache_path( abspath ):
+    '''
+    Cache file for a profile, keyed on the absolute path so different
+    workspaces do not collide.
+    '''
+    digest = hashlib.sha1( abspath.encode( 'utf-8' ) ).hexdigest()
+    return os.path.join( CACHE_DIR, f'profile-{digest}.pkl' )
+
+
+def load_profile_cached( profile_path, loader ):
+    '''
+    Load a profile through an on-disk pickle cache keyed on (mtime, size).
+
+    profile_path: Path to the profile document
+    loader: Callable taking the path and returning the parsed Profile;
+            only invoked when the cache misses
+    '''
+    abspath  = os.path.abspath( profile_path )
+    stat     = os.stat( abspath )
+    stat_key = ( stat.st_mtime_ns, stat.st_size )
+
+    memo_key = ( abspath, stat_key )
+    if memo_key in _memo:
+        return _memo[memo_key]
+
+    #  Check the on-disk cache.  Any validation failure just falls through
+    #  to a fresh parse.
+    cache_path = _cache_path( abspath )
+    try:
+        with open( cache_path, 'rb' ) as fin:
+            cached_version, cached_key, profile = pickle.load( fin )
+        if cached_version == CACHE_VERSION and cached_key == stat_key:
+            _memo[memo_key] = profile
+            return profile
+    except ( OSError, pickle.PickleError, EOFError, AttributeError, TypeError, ValueError ):
+        pass
+
+    profile = loader( profile_path )
+
+    #  Failing to write the cache is never fatal
+    try:
+        os.makedirs( CACHE_DIR, exist_ok = True )
+        with open( cache_path, 'wb' ) as fout:
+            pickle.dump( ( CACHE_VERSION, stat_key, profile ), fout )
+    except OSError:
+        pass
+
+    _memo[memo_key] = profile
+    return profile
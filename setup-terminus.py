@@ -14,11 +14,12 @@
 #       Date:    11/19/2025
 #
 
-#  Python Standard Libraries
-import argparse
+#  Python Standard Libraries.  shutil and argparse are imported inside the
+#  functions that need them so cold start skips their transitive imports.
+import concurrent.futures
 import logging
 import os
-import shutil
+import re
 import subprocess
 import sys
 
@@ -28,14 +29,25 @@ LOG_FORMAT = '%(asctime)s - %(levelname)-8s - %(message)s'
 
 def is_valid_python(string):
 
+    import shutil
+
+    #  When the requested interpreter is the one running this script, the
+    #  version is already known; skip the probe subprocess entirely
+    resolved = shutil.which( string )
+    if resolved is not None and os.path.realpath( resolved ) == os.path.realpath( sys.executable ):
+        logging.info( f'Python ({string}) version: {sys.version.split(" ")[0]}' )
+        return string
+
     #  If it's a root-relative python version,
-    pyversion = subprocess.run([string,'--version'], check=True, capture_output=True).stdout.decode('utf-8')
+    pyversion = subprocess.run([string,'--version'], check=True, capture_output=True, text=True).stdout
     logging.info( f'Python ({string}) version: {pyversion.split(" ")[1].strip()}' )
     return string
 
 
 def parse_command_line():
 
+    import argparse
+
     parser = argparse.ArgumentParser( description = 'Setup Virtual Environment for Terminus Apps.' )
 
     parser.add_argument( '-v', '--verbose',
@@ -97,83 +109,202 @@ def parse_command_line():
 
 def run_command( logger, command, desc, dry_run, exit_if_fail = True ):
 
+    #  command is an argv list; no shell sits between us and the child process
     if dry_run:
-        logger.info( f'command: {command}' )
-    else:
-        logger.debug( f'command: {command}' )
-        result = subprocess.run( command, shell = True, check = True, capture_output = True )
-        if result.returncode != 0:
-            logger.error( f'Unable to properly {desc}: ',
-                          result.stdout.decode('utf-8') )
-            if exit_if_fail:
-                sys.exit(1)
-        logger.debug( result.stdout.decode('utf-8'))
+        logger.info( f'command: {" ".join(command)}' )
+        return
+
+    import collections
+
+    logger.debug( f'command: {" ".join(command)}' )
+
+    #  Stream output into the logger as the child produces it rather than
+    #  buffering the whole run; a bounded tail feeds the failure report
+    proc = subprocess.Popen( command,
+                             stdout  = subprocess.PIPE,
+                             stderr  = subprocess.STDOUT,
+                             text    = True,
+                             bufsize = 1 )
+
+    tail = collections.deque( maxlen = 100 )
+    for line in proc.stdout:
+        line = line.rstrip()
+        tail.append( line )
+        logger.debug( line )
+
+    if proc.wait() != 0:
+        logger.error( 'Unable to properly %s:\n%s', desc, '\n'.join( tail ) )
+        if exit_if_fail:
+            sys.exit(1)
 
 def removing_existing( logger, venv_path, dry_run ):
 
+    import shutil
+
     logger.info( f'Removing existing environment' )
-    cmd = f'rm -rv {venv_path}'
-    run_command( logger, cmd, 'delete existing environment', dry_run )
+
+    #  rmtree deletes in-process; no rm fork and no verbose per-file output
+    #  to buffer and throw away
+    if dry_run:
+        logger.info( f'would rmtree {venv_path}' )
+    else:
+        shutil.rmtree( venv_path, ignore_errors = False )
 
 
 def build_virtual_environment( logger, venv_path, python_path, dry_run ):
 
+    import shutil
+
     logger.info( f'Building new Virtual Environment' )
-    cmd = f'{python_path} -m venv {venv_path}'
-    run_command( logger, cmd, 'creating new venv', dry_run )
 
-def setup_virtual_environment( logger, python_path, venv_path, dry_run ):
+    #  When the requested interpreter is the one already running this script,
+    #  build the venv in-process and skip an entire Python startup
+    resolved = shutil.which( python_path )
+    if resolved is not None and os.path.realpath( resolved ) == os.path.realpath( sys.executable ):
+        if dry_run:
+            logger.info( f'in-process: venv.EnvBuilder( with_pip = True ).create( {venv_path} )' )
+        else:
+            import venv
+            venv.EnvBuilder( with_pip = True ).create( venv_path )
+        return
 
-    cmd = f'. {venv_path}/bin/activate && pip install --upgrade pip'
-    run_command( logger, cmd, 'updating pip', dry_run )
+    cmd = [ python_path, '-m', 'venv', venv_path ]
+    run_command( logger, cmd, 'creating new venv', dry_run )
 
-    cmd = f'. {venv_path}/bin/activate && pip install conan'
-    run_command( logger, cmd, 'installing conan', dry_run )
+def setup_virtual_environment( logger, python_path, venv_path, dry_run ):
 
-def update_tmns_shell( logger, shell_path, dry_run ):
+    #  One pip invocation handles both the pip upgrade and the conan install,
+    #  so the resolver and interpreter startup run once instead of twice.
+    #  Calling the venv's pip binary directly makes activation unnecessary.
+    #  The process is spawned rather than waited on here so the caller can
+    #  overlap the download/install with local filesystem work; returns the
+    #  Popen handle, or None on a dry run.
+    cmd = [ os.path.join( venv_path, 'bin', 'pip' ), 'install', '--upgrade', 'pip', 'conan' ]
 
-    if not os.path.exists( shell_path ):
-        logger.warning( f'Shell RC file does not exist: {shell_path}' )
+    if dry_run:
+        logger.info( f'command: {" ".join(cmd)}' )
+        return None
+
+    logger.debug( f'command: {" ".join(cmd)}' )
+    return subprocess.Popen( cmd,
+                             stdout  = subprocess.PIPE,
+                             stderr  = subprocess.STDOUT,
+                             text    = True,
+                             bufsize = 1 )
+
+#  Markers whose presence in an RC file makes its helper block redundant.
+#  One alternation regex finds every marker in a single scan of the text.
+RC_SENTINELS = ( 'tmns-import', 'go-conan' )
+
+RC_SENTINEL_RE = re.compile( '|'.join( re.escape( s ) for s in RC_SENTINELS ) )
+
+def read_rc_cache( home_dir ):
+    '''
+    Read every candidate shell RC file exactly once.  Returns two maps keyed
+    on path: one of file text (None marking a file which does not exist) and
+    one of sentinel presence flags, computed here in a single pass so the
+    update code never re-scans multi-hundred-KB RC files per marker.
+    '''
+    rc_cache    = {}
+    rc_presence = {}
+
+    for candidate in [ '.bashrc', '.bash_profile', '.zshrc' ]:
+        path = os.path.join( home_dir, candidate )
+        try:
+            with open( path, 'r' ) as fin:
+                text = fin.read()
+        except OSError:
+            text = None
+
+        rc_cache[path] = text
+
+        found = set( RC_SENTINEL_RE.findall( text ) ) if text is not None else set()
+        rc_presence[path] = { name: name in found for name in RC_SENTINELS }
+
+    return rc_cache, rc_presence
+
+def update_all_rc( logger, rc_path, local_bin, venv_path, dry_run, rc_cache, rc_presence ):
+    '''
+    Append every helper block a single RC file needs (PATH export,
+    tmns-import, go-conan), consulting the presence flags computed when the
+    file was read.  A venv_path of None means conan setup was skipped, so no
+    go-conan block is written.
+    '''
+    text = rc_cache.get( rc_path )
+    if text is None:
+        logger.warning( f'Shell RC file does not exist: {rc_path}' )
         return
 
-    logger.info( f'Updating {shell_path}' )
+    presence = rc_presence[rc_path]
 
-    with open( shell_path, 'r' ) as fin:
-        text = fin.read()
+    logger.info( f'Updating {rc_path}' )
 
-    home_dir = os.environ.get( "HOME" )
-    local_bin = os.path.join( home_dir, '.local', 'bin' )
-    path_value = os.environ.get( 'PATH', '' )
+    blocks = []
 
+    path_value = os.environ.get( 'PATH', '' )
     if local_bin in path_value.split( ':' ):
         logger.info( f'{local_bin} is already in PATH.' )
     else:
         logger.info( f'{local_bin} is not in PATH; adding.' )
-        line = 'export PATH="${HOME}/.local/bin:${PATH}"\n'
-        if dry_run:
-            logger.info( f'Would append PATH update to {shell_path}' )
-        else:
-            with open( shell_path, 'a' ) as fout:
-                fout.write( line )
+        blocks.append( 'export PATH="${HOME}/.local/bin:${PATH}"\n' )
 
-    if 'tmns-import' in text:
+    if presence['tmns-import']:
         logger.info( 'tmns-import already defined. skipping' )
     else:
-        logger.info( f'tmns-import is not defined.  Adding to {shell_path}' )
-        block = '\n# Added by terminus-repo-utilities: install-local.bash\nfunction tmns-import() {\n   source ${HOME}/.local/bin/tmns_bash_aliases.bash\n}\n'
-        if dry_run:
-            logger.info( f'Would append tmns-import function to {shell_path}' )
-        else:
-            with open( shell_path, 'a' ) as fout:
-                fout.write( block )
+        logger.info( f'tmns-import is not defined.  Adding to {rc_path}' )
+        blocks.append( '\n# Added by terminus-repo-utilities: install-local.bash\nfunction tmns-import() {\n   source ${HOME}/.local/bin/tmns_bash_aliases.bash\n}\n' )
+        presence['tmns-import'] = True
 
-def install_helper_scripts( logger, dry_run, skip_shell, use_bash, use_zsh ):
+    if venv_path is not None:
+        if presence['go-conan']:
+            logger.warning( f'The command "go-conan" already in {rc_path}' )
+        else:
+            blocks.append( '\n# This function added by Terminus setup-conan script.\n'
+                           'function go-conan() {\n'
+                           f'    . {venv_path}/bin/activate\n'
+                           '}\n' )
+            presence['go-conan'] = True
 
-    home_dir = os.environ.get( "HOME" )
-    if home_dir is None:
-        logger.error( 'HOME environment variable is not set.' )
+    if not blocks:
         return
 
+    #  One open/append/close per RC file regardless of how many blocks it needs
+    if dry_run:
+        logger.info( f'Would append {len(blocks)} block(s) to {rc_path}' )
+    else:
+        with open( rc_path, 'a' ) as fout:
+            fout.writelines( blocks )
+        rc_cache[rc_path] = text + ''.join( blocks )
+
+def link_tree( source_dir, dest_dir ):
+    '''
+    Mirror source_dir into dest_dir with hard links.  One link() syscall per
+    file replaces the open/read/write/close of a copy; scandir supplies the
+    file type inline so no extra lstat per entry is needed.
+
+    The destination directory is listed once up front; that one snapshot
+    answers both the does-the-directory-exist check and every per-file
+    does-the-target-exist check, instead of a stat/unlink attempt per entry.
+    '''
+    try:
+        existing = { entry.name for entry in os.scandir( dest_dir ) }
+    except FileNotFoundError:
+        os.mkdir( dest_dir )
+        existing = set()
+
+    for entry in os.scandir( source_dir ):
+        dst_path = os.path.join( dest_dir, entry.name )
+        if entry.is_dir( follow_symlinks = False ):
+            link_tree( entry.path, dst_path )
+        else:
+            if entry.name in existing:
+                os.unlink( dst_path )
+            os.link( entry.path, dst_path )
+
+def install_helper_scripts( logger, dry_run, local_bin ):
+
+    import shutil
+
     scripts_dir = os.path.join( os.path.dirname( os.path.abspath( __file__ ) ), 'scripts' )
     source_dir = os.path.join( scripts_dir, 'utils' )
 
@@ -181,82 +312,35 @@ def install_helper_scripts( logger, dry_run, skip_shell, use_bash, use_zsh ):
         logger.error( f'Utilities source directory not found: {source_dir}' )
         return
 
-    dest_dir = os.path.join( home_dir, '.local', 'bin' )
+    dest_dir = local_bin
     logger.info( f'Installing helper scripts from {source_dir} to {dest_dir}' )
 
     if dry_run:
-        logger.info( 'Dry-run enabled; not copying files or updating shell configuration.' )
-    else:
-        os.makedirs( dest_dir, exist_ok = True )
-
-        for root, dirs, files in os.walk( source_dir ):
-            rel_root = os.path.relpath( root, source_dir )
-            target_root = dest_dir if rel_root == '.' else os.path.join( dest_dir, rel_root )
-            os.makedirs( target_root, exist_ok = True )
-            for filename in files:
-                src_path = os.path.join( root, filename )
-                dst_path = os.path.join( target_root, filename )
-                shutil.copy2( src_path, dst_path )
-
-    if skip_shell:
+        logger.info( 'Dry-run enabled; not copying files.' )
         return
 
-    shell_paths = []
-
-    if use_bash:
-        shell_paths.append( os.path.join( home_dir, '.bashrc' ) )
-    if use_zsh:
-        shell_paths.append( os.path.join( home_dir, '.zshrc' ) )
-
-    if not shell_paths:
-        for candidate in [ '.zshrc', '.bashrc' ]:
-            candidate_path = os.path.join( home_dir, candidate )
-            if os.path.exists( candidate_path ):
-                shell_paths.append( candidate_path )
+    os.makedirs( dest_dir, exist_ok = True )
 
-    for shell_path in shell_paths:
-        update_tmns_shell( logger, shell_path, dry_run )
+    #  On the same filesystem, hard links install the scripts with zero data
+    #  copied.  Across filesystems copytree still dispatches to
+    #  sendfile/copy_file_range on Linux.
+    if os.stat( source_dir ).st_dev == os.stat( dest_dir ).st_dev:
+        link_tree( source_dir, dest_dir )
+    else:
+        shutil.copytree( source_dir, dest_dir, dirs_exist_ok = True )
 
-def run_conan_setup( logger, python_path, venv_path, dry_run ):
+def run_conan_setup( logger, python_path, venv_path, dry_run, venv_exists ):
 
-    # Check if virtual environment already exists
-    if os.path.exists( venv_path ):
+    # main stats the venv once up front; trust that result here
+    if venv_exists:
         logger.info( f'Virtual environment already exists at {venv_path}' )
     else:
         logger.info( f'Creating virtual environment at {venv_path}' )
         build_virtual_environment( logger, venv_path, python_path, dry_run )
 
-    # Setup the virtual environment and install conan
-    setup_virtual_environment( logger, python_path, venv_path, dry_run )
-
-    # Add go-conan alias to shell
-    update_shell_scripts( logger, venv_path, dry_run )
-
-def update_shell_scripts( logger, venv_path, dry_run ):
-
-    #  Iterate over available scripts
-    for shell_rc in [ f'{os.environ.get("HOME")}/.bashrc', f'{os.environ.get("HOME")}/.bash_profile', f'{os.environ.get("HOME")}/.zshrc' ]:
-
-        if os.path.exists( shell_rc ):
-
-            #  Only update if RC file actually exists
-            logger.info( f'Updating: {shell_rc}' )
-
-            #  Check if shell script has the import function already
-            add_command = False
-            with open( shell_rc, 'r' ) as fin:
-                text = fin.read()
-                if 'go-conan' in text:
-                    logger.warning( f'The command "go-conan" already in {shell_rc}' )
-                else:
-                    add_command = True
-
-            if add_command:
-                cmd  = f'\necho "# This function added by Terminus setup-conan script." >> {shell_rc}\n'
-                cmd += f'echo "function go-conan() {{" >> {shell_rc}\n'
-                cmd += f"echo '    . {venv_path}/bin/activate' >> {shell_rc}\n"
-                cmd += f"echo '}}' >> {shell_rc}"
-                run_command( logger, cmd, 'adding conan alias', dry_run )
+    # Setup the virtual environment and install conan; hand the running pip
+    # process back so main can wait on it after the local work finishes
+    return setup_virtual_environment( logger, python_path, venv_path, dry_run )
 
 def main():
 
@@ -269,20 +353,80 @@ def main():
     logger.setLevel( cmd_args.log_level )
     logger.debug( 'Running Terminus setup tool' )
 
-    #  Check if environment already is setup
-    install_helper_scripts( logger,
-                            cmd_args.dry_run,
-                            cmd_args.skip_shell,
-                            cmd_args.use_bash,
-                            cmd_args.use_zsh )
+    #  Resolve HOME-derived paths and read the candidate RC files exactly
+    #  once; every downstream check works off this cache
+    home_dir = os.environ.get( 'HOME' )
+    if home_dir is None:
+        logger.error( 'HOME environment variable is not set.' )
+        return
+
+    local_bin = os.path.join( home_dir, '.local', 'bin' )
+    rc_cache, rc_presence = read_rc_cache( home_dir )
+
+    #  Stat the venv once here; everything downstream consults this flag
+    venv_exists = os.path.isdir( cmd_args.venv_path )
+
+    #  The helper-script install is filesystem-bound and the conan setup is
+    #  network-bound, so run them concurrently
+    with concurrent.futures.ThreadPoolExecutor( max_workers = 2 ) as pool:
+
+        helper_task = pool.submit( install_helper_scripts,
+                                   logger,
+                                   cmd_args.dry_run,
+                                   local_bin )
 
-    if cmd_args.skip_conan:
-        logger.info( 'Skipping Conan setup.' )
+        conan_task = None
+        if cmd_args.skip_conan:
+            logger.info( 'Skipping Conan setup.' )
+        else:
+            conan_task = pool.submit( run_conan_setup,
+                                      logger,
+                                      cmd_args.python_path,
+                                      cmd_args.venv_path,
+                                      cmd_args.dry_run,
+                                      venv_exists )
+
+        #  result() re-raises anything a task failed with.  The conan task
+        #  hands back the still-running pip process.
+        helper_task.result()
+        pip_proc = conan_task.result() if conan_task is not None else None
+
+    #  One pass over the deduplicated RC list handles every shell update.
+    #  The pip install keeps downloading in the background meanwhile.
+    if cmd_args.skip_shell:
+        logger.info( 'Skipping shell RC updates.' )
     else:
-        run_conan_setup( logger,
-                         cmd_args.python_path,
-                         cmd_args.venv_path,
-                         cmd_args.dry_run )
+        shell_paths = []
+
+        if cmd_args.use_bash:
+            shell_paths.append( os.path.join( home_dir, '.bashrc' ) )
+        if cmd_args.use_zsh:
+            shell_paths.append( os.path.join( home_dir, '.zshrc' ) )
+
+        if not shell_paths:
+            shell_paths = [ path for path, text in rc_cache.items() if text is not None ]
+
+        conan_venv_path = None if cmd_args.skip_conan else cmd_args.venv_path
+
+        for rc_path in shell_paths:
+            update_all_rc( logger, rc_path, local_bin, conan_venv_path, cmd_args.dry_run, rc_cache, rc_presence )
+
+    #  Only now block on the pip upgrade/conan install.  Stream its output
+    #  line-by-line so progress shows up as it happens and memory stays flat;
+    #  a bounded tail is kept for the failure report.
+    if pip_proc is not None:
+        import collections
+
+        tail = collections.deque( maxlen = 100 )
+        for line in pip_proc.stdout:
+            line = line.rstrip()
+            tail.append( line )
+            logger.debug( line )
+
+        if pip_proc.wait() != 0:
+            logger.error( 'Unable to properly update pip and install conan:\n%s',
+                          '\n'.join( tail ) )
+            sys.exit(1)
 
 if __name__ == '__main__':
     main()